@@ -0,0 +1,93 @@
+"""
+Bytes on the wire and serialization CPU per endpoint, per encoding.
+
+Payloads are synthetic but shaped like the real responses (streamed
+raw_response lines, long analysis text). Run from the FastAPI folder:
+
+    python benchmark_encoding.py
+"""
+import json
+import timeit
+
+from encoding import compress, dumps_json, dumps_msgpack, msgpack, orjson, zstandard
+from health_metrics import compute_metrics
+from main import HealthFormData, root
+
+ANALYSIS_TEXT = (
+    "Based on your profile, aim for balanced meals with lean protein, whole grains "
+    "and vegetables. Keep sodium under 1500 mg per day and spread carbohydrates "
+    "evenly across meals to keep blood sugar stable. "
+) * 40
+
+
+def fake_raw_response(text: str, chunk: int = 24) -> str:
+    """Mimic the orchestrator's newline-delimited stream of message.delta events"""
+    lines = [json.dumps({"event": "run.started", "data": {"thread_id": "t-123", "run_id": "r-456"}})]
+    for i in range(0, len(text), chunk):
+        lines.append(json.dumps({
+            "event": "message.delta",
+            "data": {"thread_id": "t-123", "run_id": "r-456", "delta": {"content": text[i:i + chunk]}}
+        }))
+    lines.append(json.dumps({"event": "message.completed", "data": {"content": text}}))
+    return "\n".join(lines)
+
+
+FORM = HealthFormData(
+    name="John Doe", age=35, weight=80, height=175,
+    health_conditions=["diabetes", "hypertension"],
+    dietary_preferences=["vegetarian", "low-carb"],
+    activity_level="moderate", goals=["weight loss"],
+)
+RAW = fake_raw_response(ANALYSIS_TEXT)
+
+PAYLOADS = {
+    "POST /submit-health-form": {
+        "success": True, "thread_id": "t-123", "run_id": "r-456",
+        "analysis": ANALYSIS_TEXT, "metrics": compute_metrics([FORM])[0],
+        "message": "Health analysis completed successfully", "raw_response": RAW,
+    },
+    "POST /run-*-agent": {"success": True, "response": RAW, "thread_id": "t-123"},
+    "POST /send-whatsapp": {
+        "success": True, "message": "WhatsApp messages sent successfully",
+        "content": ANALYSIS_TEXT[:1200], "thread_id": "t-123",
+    },
+    "POST /health-metrics (x100)": {"success": True, "metrics": compute_metrics([FORM] * 100)},
+}
+
+
+def cpu_us(fn, number: int = 200) -> float:
+    return timeit.timeit(fn, number=number) / number * 1e6
+
+
+def stdlib_json(content) -> bytes:
+    return json.dumps(content).encode("utf-8")
+
+
+def main():
+    import asyncio
+    PAYLOADS["GET /"] = asyncio.run(root())
+
+    serializers = {"json (stdlib)": stdlib_json}
+    if orjson is not None:
+        serializers["json (orjson)"] = dumps_json
+    if msgpack is not None:
+        serializers["msgpack"] = dumps_msgpack
+    encodings = ["identity", "gzip"] + (["zstd"] if zstandard is not None else [])
+
+    print(f"{'endpoint':28} {'serializer':15} {'encode us':>10} " +
+          " ".join(f"{e + ' B':>11} {e + ' us':>10}" for e in encodings))
+    for endpoint, content in PAYLOADS.items():
+        for name, dumps in serializers.items():
+            body = dumps(content)
+            row = f"{endpoint:28} {name:15} {cpu_us(lambda: dumps(content)):10.1f} "
+            for encoding in encodings:
+                if encoding == "identity":
+                    row += f"{len(body):11d} {0.0:10.1f} "
+                else:
+                    size = len(compress(body, encoding))
+                    row += f"{size:11d} {cpu_us(lambda: compress(body, encoding), 50):10.1f} "
+            print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+import gzip
+import json
+import os
+from contextvars import ContextVar
+from typing import Optional, Tuple
+
+from starlette.responses import Response
+
+# Optional fast/binary codecs; fall back to stdlib json and gzip-only
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+# Bodies smaller than this are sent uncompressed
+COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "1024"))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+ZSTD_LEVEL = int(os.getenv("ZSTD_LEVEL", "3"))
+
+# (Accept, Accept-Encoding) of the request being handled
+negotiation: ContextVar[Tuple[str, str]] = ContextVar("negotiation", default=("", ""))
+
+
+# ==========================
+# SERIALIZERS
+# ==========================
+def dumps_json(content) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def dumps_msgpack(content) -> bytes:
+    return msgpack.packb(content, use_bin_type=True)
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(body)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+
+def parse_qvalues(header: str) -> dict:
+    """Parse an Accept / Accept-Encoding header into {token: q}"""
+    qvalues = {}
+    for part in header.lower().split(","):
+        name, _, params = part.partition(";")
+        name = name.strip()
+        if not name:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        qvalues[name] = max(q, qvalues.get(name, 0.0))
+    return qvalues
+
+
+def pick_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Choose the highest-q supported coding from an Accept-Encoding header
+    - An explicitly listed coding uses its own q (so "gzip;q=0" refuses gzip
+      even with "*"); unlisted codings take the q of "*"
+    - Ties go to zstd
+    """
+    qvalues = parse_qvalues(accept_encoding)
+    wildcard_q = qvalues.get("*", 0.0)
+    supported = (["zstd"] if zstandard is not None else []) + ["gzip"]
+
+    best, best_q = None, 0.0
+    for coding in supported:
+        q = qvalues.get(coding, wildcard_q)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def wants_msgpack(accept: str) -> bool:
+    """True if Accept ranks MessagePack above zero and at least as high as JSON"""
+    if msgpack is None:
+        return False
+    qvalues = parse_qvalues(accept)
+    msgpack_q = qvalues.get(MSGPACK_MEDIA_TYPE, 0.0)
+    json_q = max(qvalues.get(JSON_MEDIA_TYPE, 0.0), qvalues.get("application/*", 0.0), qvalues.get("*/*", 0.0))
+    return msgpack_q > 0 and msgpack_q >= json_q
+
+
+# ==========================
+# RESPONSE CLASS + MIDDLEWARE
+# ==========================
+class NegotiatedResponse(Response):
+    """
+    Default response class for the API
+    - JSON via orjson, or MessagePack when Accept ranks application/msgpack at least as high as JSON
+    - zstd/gzip per Accept-Encoding when the body is at least COMPRESS_MIN_SIZE
+    """
+    media_type = JSON_MEDIA_TYPE
+
+    def __init__(self, content=None, status_code: int = 200, headers=None, media_type=None, background=None):
+        accept, accept_encoding = negotiation.get()
+        self.use_msgpack = wants_msgpack(accept)
+        self.content_encoding = pick_encoding(accept_encoding)
+        if media_type is None and self.use_msgpack:
+            media_type = MSGPACK_MEDIA_TYPE
+        super().__init__(content, status_code, headers, media_type, background)
+
+        self.headers["vary"] = "Accept, Accept-Encoding"
+        if self.content_encoding is not None:
+            self.headers["content-encoding"] = self.content_encoding
+
+    def render(self, content) -> bytes:
+        body = dumps_msgpack(content) if self.use_msgpack else dumps_json(content)
+        if self.content_encoding is None or len(body) < COMPRESS_MIN_SIZE:
+            self.content_encoding = None
+            return body
+        return compress(body, self.content_encoding)
+
+
+class NegotiationMiddleware:
+    """Expose the request's Accept headers to NegotiatedResponse"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            headers = dict(scope["headers"])
+            negotiation.set((
+                headers.get(b"accept", b"").decode("latin-1").lower(),
+                headers.get(b"accept-encoding", b"").decode("latin-1"),
+            ))
+        await self.app(scope, receive, send)
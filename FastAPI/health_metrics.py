@@ -0,0 +1,155 @@
+import re
+from typing import List, Sequence
+
+import numpy as np
+
+# ==========================
+# REFERENCE VALUES
+# ==========================
+# Mifflin-St Jeor sex constant; unknown / non-binary uses the midpoint
+SEX_CONSTANTS = {"male": 5.0, "female": -161.0}
+DEFAULT_SEX_CONSTANT = -78.0
+
+ACTIVITY_FACTORS = {
+    "sedentary": 1.2,
+    "light": 1.375,
+    "moderate": 1.55,
+    "active": 1.725,
+    "very_active": 1.9,
+}
+DEFAULT_ACTIVITY_FACTOR = 1.2
+
+MIN_CALORIE_TARGET = 1200.0
+WEIGHT_LOSS_DEFICIT = 500.0
+WEIGHT_GAIN_SURPLUS = 300.0
+
+# Macro split, as shares of the calorie target. Protein is sized from a
+# reference weight (adjusted body weight above BMI 22), capped, and fat
+# keeps its floor; carbs give way so the three always add up to the target.
+REFERENCE_BMI = 22.0
+ADJUSTED_WEIGHT_FACTOR = 0.4
+MAX_PROTEIN_SHARE = 0.35
+MIN_FAT_SHARE = 0.20
+CARB_SHARE = 0.50
+DIABETIC_CARB_SHARE = 0.40
+LOW_CARB_SHARE = 0.25
+
+# Pattern -> risk flag, searched in health_conditions (lowercased).
+# Word boundaries keep e.g. "heartburn" from reading as cardiac.
+# Negated mentions ("non-diabetic") do not count.
+CONDITION_FLAGS = {
+    re.compile(r"(?<!non-)(?<!non )(?<!pre-)\bdiabet"): "diabetes",
+    re.compile(r"(?<!non-)(?<!non )\bpre-?diabet"): "prediabetes",
+    re.compile(r"\bhypertension\b"): "hypertension",
+    re.compile(r"\bhigh blood pressure\b"): "hypertension",
+    re.compile(r"\bheart (disease|failure|attack|condition)"): "cardiac",
+    re.compile(r"\bcardi(ac|ovascular|omyopathy)\b"): "cardiac",
+    re.compile(r"\b(kidney|renal)\b"): "renal",
+    re.compile(r"\bpregnan"): "pregnancy",
+    re.compile(r"\bcholesterol\b"): "high_cholesterol",
+}
+
+BMI_CATEGORIES = np.array(["underweight", "normal", "overweight", "obese"])
+BMI_BOUNDS = np.array([18.5, 25.0, 30.0])
+
+
+def _has_any(values: Sequence[str], keywords: Sequence[str]) -> bool:
+    return any(k in v.lower() for v in values for k in keywords)
+
+
+def condition_flags_for(health_conditions: Sequence[str]) -> List[str]:
+    conditions = [c.lower() for c in health_conditions]
+    flags = []
+    for pattern, flag in CONDITION_FLAGS.items():
+        if flag not in flags and any(pattern.search(c) for c in conditions):
+            flags.append(flag)
+    return flags
+
+
+def compute_metrics(forms: Sequence) -> List[dict]:
+    """
+    Compute BMI, BMR, TDEE, calorie/macro targets and risk flags for a batch
+    - Accepts any objects shaped like HealthFormData
+    - Arithmetic runs column-wise over the whole batch with NumPy
+    """
+    if not forms:
+        return []
+
+    weight = np.array([f.weight for f in forms], dtype=float)
+    height = np.array([f.height for f in forms], dtype=float)
+    age = np.array([f.age for f in forms], dtype=float)
+    sex_const = np.array(
+        [SEX_CONSTANTS.get((getattr(f, "gender", None) or "").lower(), DEFAULT_SEX_CONSTANT) for f in forms]
+    )
+    activity = np.array(
+        [ACTIVITY_FACTORS.get(f.activity_level.lower().replace(" ", "_"), DEFAULT_ACTIVITY_FACTOR) for f in forms]
+    )
+
+    condition_flags = [condition_flags_for(f.health_conditions) for f in forms]
+
+    wants_loss = np.array([_has_any(f.goals, ("loss", "lose")) for f in forms])
+    wants_gain = np.array([_has_any(f.goals, ("gain", "muscle", "bulk")) for f in forms]) & ~wants_loss
+    diabetic = np.array([bool({"diabetes", "prediabetes"} & set(flags)) for flags in condition_flags])
+    low_carb = np.array([_has_any(f.dietary_preferences, ("low-carb", "low carb", "keto")) for f in forms])
+
+    bmi = weight / (height / 100) ** 2
+    bmr = 10 * weight + 6.25 * height - 5 * age + sex_const
+    tdee = bmr * activity
+
+    target = tdee - WEIGHT_LOSS_DEFICIT * wants_loss + WEIGHT_GAIN_SURPLUS * wants_gain
+    target = np.maximum(target, MIN_CALORIE_TARGET)
+
+    ideal_weight = REFERENCE_BMI * (height / 100) ** 2
+    reference_weight = np.where(
+        weight > ideal_weight,
+        ideal_weight + ADJUSTED_WEIGHT_FACTOR * (weight - ideal_weight),
+        weight
+    )
+    protein_kcal = np.minimum(4 * reference_weight * np.where(wants_gain, 1.6, 1.2), MAX_PROTEIN_SHARE * target)
+    carb_share = np.where(low_carb, LOW_CARB_SHARE, np.where(diabetic, DIABETIC_CARB_SHARE, CARB_SHARE))
+    carb_kcal = np.minimum(carb_share * target, target - protein_kcal - MIN_FAT_SHARE * target)
+    fat_kcal = target - protein_kcal - carb_kcal
+
+    protein_g = protein_kcal / 4
+    carbs_g = carb_kcal / 4
+    fat_g = fat_kcal / 9
+
+    bmi_category = BMI_CATEGORIES[np.searchsorted(BMI_BOUNDS, bmi, side="right")]
+
+    results = []
+    for i, f in enumerate(forms):
+        flags = list(condition_flags[i])
+        if bmi_category[i] != "normal":
+            flags.append(str(bmi_category[i]))
+        if activity[i] <= ACTIVITY_FACTORS["sedentary"]:
+            flags.append("sedentary")
+        if age[i] >= 65:
+            flags.append("older_adult")
+
+        results.append({
+            "bmi": round(float(bmi[i]), 1),
+            "bmi_category": str(bmi_category[i]),
+            "bmr_kcal": int(round(bmr[i])),
+            "tdee_kcal": int(round(tdee[i])),
+            "calorie_target_kcal": int(round(target[i])),
+            "macros_g": {
+                "protein": int(round(protein_g[i])),
+                "carbs": int(round(carbs_g[i])),
+                "fat": int(round(fat_g[i])),
+            },
+            "risk_flags": flags,
+        })
+    return results
+
+
+def format_metrics(metrics: dict) -> str:
+    """One-line summary of compute_metrics() output for agent prompts"""
+    macros = metrics["macros_g"]
+    flags = ", ".join(metrics["risk_flags"]) or "none"
+    return (
+        f"BMI {metrics['bmi']} ({metrics['bmi_category']}); "
+        f"BMR {metrics['bmr_kcal']} kcal; TDEE {metrics['tdee_kcal']} kcal; "
+        f"target {metrics['calorie_target_kcal']} kcal/day; "
+        f"macros P{macros['protein']}g C{macros['carbs']}g F{macros['fat']}g; "
+        f"flags: {flags}"
+    )
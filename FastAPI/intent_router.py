@@ -0,0 +1,187 @@
+import math
+import re
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+# ==========================
+# KEYWORD INDEX
+# ==========================
+# Hand-picked vocabulary per specialist intent. Words shared by several
+# intents get a lower IDF weight, so "desk" counts less than "posture".
+INTENT_KEYWORDS = {
+    "diet": [
+        "diet", "meal", "food", "eat", "eating", "calorie", "protein", "carb",
+        "nutrition", "breakfast", "lunch", "dinner", "snack", "recipe",
+        "vegetarian", "vegan", "sugar", "fat", "fiber", "vitamin", "weight",
+        "drink", "hydration", "water",
+    ],
+    "sleep": [
+        "sleep", "sleeping", "insomnia", "nap", "bedtime", "bed", "tired",
+        "rest", "wake", "waking", "dream", "snore", "snoring", "fatigue",
+        "melatonin", "night",
+    ],
+    "exercise": [
+        "exercise", "workout", "gym", "run", "running", "cardio", "strength",
+        "training", "walk", "walking", "step", "yoga", "stretch", "muscle",
+        "fitness", "jog", "jogging", "swim", "swimming", "weight",
+    ],
+    "posture": [
+        "posture", "back", "neck", "shoulder", "spine", "slouch", "slouching",
+        "sitting", "sit", "ergonomic", "desk", "hunch", "chair",
+    ],
+    "alert": [
+        "emergency", "urgent", "chest", "pain", "dizzy", "faint", "alert",
+        "abnormal", "missed", "medication", "blood", "pressure", "heart",
+        "breathing", "breath",
+    ],
+    "work": [
+        "work", "break", "meeting", "stress", "stressed", "burnout", "office",
+        "productivity", "screen", "deadline", "desk",
+    ],
+    "appointment": [
+        "appointment", "doctor", "book", "schedule", "therapy", "lab", "test",
+        "checkup", "clinic",
+    ],
+}
+
+# A query is routed locally only if its best intent is backed by at least
+# MIN_DISTINCT_HITS different keywords and holds at least MIN_CONFIDENCE of
+# the total score. A single keyword ("run", "back", "walk") is too often
+# incidental to route on.
+MIN_DISTINCT_HITS = 2
+MIN_CONFIDENCE = 0.6
+
+FALLBACK_INTENT = "ask_orchestrate"
+
+_TOKEN_RE = re.compile(r"[a-z]+")
+
+
+def normalize(word: str) -> str:
+    """Crude plural folding so "meals" and "meal" share an index entry"""
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def tokenize(text: str) -> list:
+    return [normalize(w) for w in _TOKEN_RE.findall(text.lower())]
+
+
+def build_index(intent_keywords: dict) -> dict:
+    """Build token -> [(intent, idf weight)] once at import time"""
+    postings = {}
+    for intent, words in intent_keywords.items():
+        for word in {normalize(w) for w in words}:
+            postings.setdefault(word, []).append(intent)
+
+    n_intents = len(intent_keywords)
+    return {
+        token: [(intent, 1.0 + math.log(n_intents / len(intents))) for intent in intents]
+        for token, intents in postings.items()
+    }
+
+
+INDEX = build_index(INTENT_KEYWORDS)
+
+
+def classify(message: str) -> Tuple[Optional[str], float]:
+    """
+    Map a free-text message to a specialist intent
+    - Returns (intent, confidence); intent is None when confidence is low
+    """
+    scores = {}
+    hits = {}
+    for token in tokenize(message):
+        for intent, weight in INDEX.get(token, ()):
+            scores[intent] = scores.get(intent, 0.0) + weight
+            hits.setdefault(intent, set()).add(token)
+
+    if not scores:
+        return None, 0.0
+
+    intent, top = max(scores.items(), key=lambda kv: kv[1])
+    confidence = top / sum(scores.values())
+    if len(hits[intent]) < MIN_DISTINCT_HITS or confidence < MIN_CONFIDENCE:
+        return None, confidence
+    return intent, confidence
+
+
+# ==========================
+# ROUTING STATS
+# ==========================
+class RouterStats:
+    """Counters for local routing decisions, accuracy feedback and latency"""
+
+    def __init__(self, max_tracked_runs: int = 1000):
+        self.routed = {}
+        self.fallbacks = 0
+        self.classify_seconds = 0.0
+        self.direct_runs = 0
+        self.direct_seconds = 0.0
+        self.fallback_runs = 0
+        self.fallback_seconds = 0.0
+        # "local" scores the classifier's own picks; "fallback" scores
+        # queries it declined and sent to Ask Orchestrate
+        self.feedback = {"local": [0, 0], "fallback": [0, 0]}  # [total, correct]
+        self.max_tracked_runs = max_tracked_runs
+        # run_id -> predicted intent (FALLBACK_INTENT for fallbacks)
+        self.predictions: OrderedDict = OrderedDict()
+
+    def record_decision(self, intent: Optional[str], classify_seconds: float):
+        self.classify_seconds += classify_seconds
+        if intent is None:
+            self.fallbacks += 1
+        else:
+            self.routed[intent] = self.routed.get(intent, 0) + 1
+
+    def record_run(self, routed_locally: bool, run_id: Optional[str], intent: str, seconds: float):
+        if routed_locally:
+            self.direct_runs += 1
+            self.direct_seconds += seconds
+        else:
+            self.fallback_runs += 1
+            self.fallback_seconds += seconds
+
+        if run_id:
+            self.predictions[run_id] = intent
+            while len(self.predictions) > self.max_tracked_runs:
+                self.predictions.popitem(last=False)
+
+    def record_feedback(self, run_id: str, correct_intent: str) -> Optional[bool]:
+        """Compare a reported intent with what we routed; None if run is unknown"""
+        predicted = self.predictions.pop(run_id, None)
+        if predicted is None:
+            return None
+        correct = predicted == correct_intent
+        counts = self.feedback["fallback" if predicted == FALLBACK_INTENT else "local"]
+        counts[0] += 1
+        counts[1] += int(correct)
+        return correct
+
+    def snapshot(self) -> dict:
+        decisions = self.fallbacks + sum(self.routed.values())
+        avg_direct = self.direct_seconds / self.direct_runs if self.direct_runs else None
+        avg_fallback = self.fallback_seconds / self.fallback_runs if self.fallback_runs else None
+
+        # Estimated from the observed gap between specialist runs and
+        # Ask Orchestrate runs; unknown until both have been seen
+        saved = None
+        if avg_direct is not None and avg_fallback is not None:
+            saved = max(avg_fallback - avg_direct, 0.0) * self.direct_runs
+
+        return {
+            "decisions": decisions,
+            "routed_locally": dict(self.routed),
+            "fallbacks": self.fallbacks,
+            "local_hit_rate": (decisions - self.fallbacks) / decisions if decisions else None,
+            "avg_classify_ms": self.classify_seconds / decisions * 1000 if decisions else None,
+            "avg_direct_run_s": avg_direct,
+            "avg_fallback_run_s": avg_fallback,
+            "estimated_latency_saved_s": saved,
+            "feedback": {
+                kind: {"total": total, "correct": correct, "accuracy": correct / total if total else None}
+                for kind, (total, correct) in self.feedback.items()
+            },
+        }
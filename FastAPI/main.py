@@ -1,13 +1,21 @@
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel, field_validator
+from fastapi import Body, FastAPI, HTTPException, Query, WebSocket, WebSocketDisconnect
+from pydantic import BaseModel, Field, ValidationError, field_validator
 from dotenv import load_dotenv
-from typing import Optional, List
+from typing import Optional, List, Callable, Awaitable
 from datetime import datetime, timedelta
+from contextlib import asynccontextmanager
 import httpx
 import os
 import json
+import time
 import asyncio
 
+from encoding import NegotiatedResponse, NegotiationMiddleware
+from health_metrics import compute_metrics, format_metrics
+from intent_router import FALLBACK_INTENT, RouterStats, classify
+from rate_limit import RateLimitMiddleware, TokenBucketLimiter, client_key
+from run_ledger import RunLedger
+
 # ==========================
 # LOAD ENV VARIABLES
 # ==========================
@@ -34,6 +42,72 @@ PA_ALLOCATION_AGENT_ID = os.getenv("PA_ALLOCATION_AGENT_ID")
 PA_MANAGER_ID = os.getenv("PA_MANAGER_ID")
 ASKORCHESTRATE_ID = os.getenv("ASKORCHESTRATE_ID")
 
+# Specialist agents that free-text queries can be routed to directly
+INTENT_AGENT_IDS = {
+    "diet": DIETAGENT_ID,
+    "sleep": SLEEPAGENT_ID,
+    "exercise": EXERCISEAGENT_ID,
+    "posture": POSTURE_AGENT_ID,
+    "alert": ALERT_AGENT_ID,
+    "work": WORK_AGENT_ID,
+    "appointment": APPOINTMENT_AUTOMATION_ID,
+}
+
+# Local run ledger (SQLite) used for thread/run history lookups
+LEDGER_DB_PATH = os.getenv("LEDGER_DB_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "run_ledger.db"))
+LEDGER_RETENTION_DAYS = float(os.getenv("LEDGER_RETENTION_DAYS", "7"))
+LEDGER_MAX_ROWS = int(os.getenv("LEDGER_MAX_ROWS", "50000"))
+LEDGER_COMPACT_INTERVAL_SEC = float(os.getenv("LEDGER_COMPACT_INTERVAL_SEC", "600"))
+
+# Agent ID -> name, for labelling ledger entries
+AGENT_NAMES = {
+    agent_id: name for name, agent_id in {
+        "analysis": ANALYSIS_AGENT_ID,
+        "whatsapp": WHATSAPP_AGENT_ID,
+        "calendar": CALENDAR_AGENT_ID,
+        "recommendation": RECOMMENDATION_AGENT_ID,
+        "appointment_automation": APPOINTMENT_AUTOMATION_ID,
+        "alert": ALERT_AGENT_ID,
+        "health_assistant": HEALTH_ASSISTANT_AGENT_ID,
+        "work": WORK_AGENT_ID,
+        "bodyhealth": BODYHEALTHAGENT_ID,
+        "posture": POSTURE_AGENT_ID,
+        "sleep": SLEEPAGENT_ID,
+        "exercise": EXERCISEAGENT_ID,
+        "diet": DIETAGENT_ID,
+        "healthy_diet": HEALTHYDIET_ID,
+        "pa_allocation": PA_ALLOCATION_AGENT_ID,
+        "pa_manager": PA_MANAGER_ID,
+        "ask_orchestrate": ASKORCHESTRATE_ID,
+    }.items() if agent_id
+}
+
+# WebSocket multiplexing limits (per connection)
+WS_MAX_CONCURRENT_RUNS = int(os.getenv("WS_MAX_CONCURRENT_RUNS", "8"))
+WS_SEND_QUEUE_SIZE = int(os.getenv("WS_SEND_QUEUE_SIZE", "64"))
+
+# Per-client rate limiting (token buckets keyed by allow-listed API key, else IP)
+RATE_LIMIT_CAPACITY = float(os.getenv("RATE_LIMIT_CAPACITY", "30"))
+RATE_LIMIT_REFILL_PER_SEC = float(os.getenv("RATE_LIMIT_REFILL_PER_SEC", "0.5"))
+RATE_LIMIT_MAX_CLIENTS = int(os.getenv("RATE_LIMIT_MAX_CLIENTS", "10000"))
+RATE_LIMIT_API_KEYS = frozenset(k.strip() for k in os.getenv("RATE_LIMIT_API_KEYS", "").split(",") if k.strip())
+
+# Tokens charged per request; agent runs cost more than local reads
+ENDPOINT_COSTS = {
+    "/submit-health-form": 5,
+    "/orchestrate-run": 3,
+    "/run-*": 3,
+    "/send-whatsapp": 3,
+    "/add-calendar-events": 3,
+    "/ask": 3,
+    "/orchestrate-agents": 2,
+    "/get-token": 2,
+}
+DEFAULT_ENDPOINT_COST = 1
+
+# Largest batch accepted by POST /health-metrics (charged DEFAULT_ENDPOINT_COST)
+HEALTH_METRICS_MAX_BATCH = int(os.getenv("HEALTH_METRICS_MAX_BATCH", "100"))
+
 # Validate required items
 missing = []
 for k, v in {
@@ -96,10 +170,59 @@ class TokenManager:
 # Global token manager
 token_manager = TokenManager()
 
+# Global routing stats for /ask
+router_stats = RouterStats()
+
+# Global run ledger
+run_ledger = RunLedger(
+    LEDGER_DB_PATH,
+    retention_days=LEDGER_RETENTION_DAYS,
+    max_rows=LEDGER_MAX_ROWS
+)
+
+# Global rate limiter
+rate_limiter = TokenBucketLimiter(
+    capacity=RATE_LIMIT_CAPACITY,
+    refill_per_sec=RATE_LIMIT_REFILL_PER_SEC,
+    max_clients=RATE_LIMIT_MAX_CLIENTS
+)
+
 # ==========================
 # FASTAPI APP
 # ==========================
-app = FastAPI(title="Multi-Agent Health Orchestrator API")
+async def compact_ledger_periodically():
+    """Apply ledger retention off the request path"""
+    while True:
+        await asyncio.sleep(LEDGER_COMPACT_INTERVAL_SEC)
+        try:
+            removed = await asyncio.to_thread(run_ledger.compact)
+            if removed:
+                print(f" Run ledger compacted, removed {removed} rows")
+        except Exception as e:
+            print(f" Warning: Run ledger compaction failed: {str(e)}")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    compactor = asyncio.create_task(compact_ledger_periodically())
+    try:
+        yield
+    finally:
+        compactor.cancel()
+        await asyncio.gather(compactor, return_exceptions=True)
+
+app = FastAPI(
+    title="Multi-Agent Health Orchestrator API",
+    default_response_class=NegotiatedResponse,
+    lifespan=lifespan
+)
+app.add_middleware(NegotiationMiddleware)
+app.add_middleware(
+    RateLimitMiddleware,
+    limiter=rate_limiter,
+    costs=ENDPOINT_COSTS,
+    default_cost=DEFAULT_ENDPOINT_COST,
+    api_keys=RATE_LIMIT_API_KEYS
+)
 
 # ==========================
 # HELPER FUNCTIONS
@@ -128,6 +251,17 @@ def extract_run_id(response_text: str) -> Optional[str]:
             continue
     return None
 
+def extract_delta_content(data: dict) -> Optional[str]:
+    """Extract the content of a single message.delta event, if any"""
+    if data.get('event') != 'message.delta' or 'data' not in data:
+        return None
+    content = (
+        data['data'].get('content') or
+        data['data'].get('delta', {}).get('content') or
+        data['data'].get('text', '')
+    )
+    return str(content) if content else None
+
 def extract_content(response_text: str) -> str:
     """Extract actual message content from streaming response"""
     content_parts = []
@@ -139,14 +273,9 @@ def extract_content(response_text: str) -> str:
             
             # Look for message.delta events with content
             if data.get('event') == 'message.delta':
-                if 'data' in data:
-                    content = (
-                        data['data'].get('content') or
-                        data['data'].get('delta', {}).get('content') or
-                        data['data'].get('text', '')
-                    )
-                    if content:
-                        content_parts.append(str(content))
+                content = extract_delta_content(data)
+                if content:
+                    content_parts.append(content)
             
             # Also check for message.completed events
             elif data.get('event') == 'message.completed':
@@ -160,9 +289,72 @@ def extract_content(response_text: str) -> str:
 async def run_orchestrator_agent(
     message: str,
     agent_id: str,
-    thread_id: Optional[str] = None
+    thread_id: Optional[str] = None,
+    on_delta: Optional[Callable[[str], Awaitable[None]]] = None
+) -> dict:
+    """
+    Generic function to run any agent through orchestrator
+    - If on_delta is given, the upstream stream is read line by line and
+      each message.delta chunk is awaited through it as it arrives
+    - Every call is recorded in the local run ledger, including failed and
+      cancelled ones; the write runs in a worker thread
+    """
+    started_at = time.time()
+    status = "cancelled"
+    result: dict = {}
+    try:
+        result = await call_orchestrator(message, agent_id, thread_id, on_delta)
+        status = "success" if result.get("success") else "error"
+        return result
+    except Exception as e:
+        # e.g. token refresh failing before the upstream request is made
+        status = "error"
+        result = {"success": False, "error": f"Exception: {str(e)}"}
+        raise
+    finally:
+        write = asyncio.get_running_loop().run_in_executor(
+            None,
+            record_run,
+            agent_id,
+            started_at,
+            time.time(),
+            result,
+            status,
+            thread_id
+        )
+        # A cancelled task must not wait; the write still completes in the background
+        if status != "cancelled":
+            await write
+
+def record_run(
+    agent_id: str,
+    started_at: float,
+    finished_at: float,
+    result: dict,
+    status: str,
+    thread_id: Optional[str]
+):
+    """Write one run to the ledger (called from a worker thread)"""
+    try:
+        run_ledger.record(
+            agent_id=agent_id,
+            agent=AGENT_NAMES.get(agent_id),
+            started_at=started_at,
+            finished_at=finished_at,
+            result=result,
+            thread_id=thread_id,
+            status=status
+        )
+    except Exception as e:
+        print(f" Warning: Could not record run in ledger: {str(e)}")
+
+async def call_orchestrator(
+    message: str,
+    agent_id: str,
+    thread_id: Optional[str] = None,
+    on_delta: Optional[Callable[[str], Awaitable[None]]] = None
 ) -> dict:
-    """Generic function to run any agent through orchestrator"""
+    """Single POST to /v1/orchestrate/runs, see run_orchestrator_agent"""
     
     # Get valid bearer token
     bearer_token = await token_manager.get_token()
@@ -190,16 +382,38 @@ async def run_orchestrator_agent(
     
     try:
         async with httpx.AsyncClient(timeout=120) as client:
-            response = await client.post(url, headers=headers, json=payload)
-            
-            if response.status_code != 200:
-                return {
-                    "success": False,
-                    "error": f"HTTP {response.status_code}",
-                    "response": response.text
-                }
-            
-            response_text = response.text
+            if on_delta is None:
+                response = await client.post(url, headers=headers, json=payload)
+                
+                if response.status_code != 200:
+                    return {
+                        "success": False,
+                        "error": f"HTTP {response.status_code}",
+                        "response": response.text
+                    }
+                
+                response_text = response.text
+            else:
+                async with client.stream("POST", url, headers=headers, json=payload) as response:
+                    if response.status_code != 200:
+                        await response.aread()
+                        return {
+                            "success": False,
+                            "error": f"HTTP {response.status_code}",
+                            "response": response.text
+                        }
+                    
+                    lines = []
+                    async for line in response.aiter_lines():
+                        lines.append(line)
+                        try:
+                            content = extract_delta_content(json.loads(line))
+                        except Exception:
+                            continue
+                        if content:
+                            # Awaiting here is what gives the caller backpressure
+                            await on_delta(content)
+                    response_text = "\n".join(lines)
             
             return {
                 "success": True,
@@ -221,13 +435,14 @@ async def run_orchestrator_agent(
 # ==========================
 class HealthFormData(BaseModel):
     name: str
-    age: int
-    weight: float  # kg
-    height: float  # cm
+    age: int = Field(gt=0)
+    weight: float = Field(gt=0, allow_inf_nan=False)  # kg
+    height: float = Field(gt=0, allow_inf_nan=False)  # cm
     health_conditions: List[str] = []
     dietary_preferences: List[str] = []
     activity_level: str  # sedentary, light, moderate, active, very_active
     goals: List[str] = []
+    gender: Optional[str] = None  # male, female, non-binary, prefer-not-to-say
 
 class ThreadRequest(BaseModel):
     thread_id: str
@@ -241,6 +456,25 @@ class RunRequest(BaseModel):
     def empty_string_to_none(cls, v):
         return None if v in ("", None) else v
 
+class AskRequest(BaseModel):
+    message: str
+    thread_id: Optional[str] = None
+    
+    @field_validator("thread_id", mode="before")
+    def empty_string_to_none(cls, v):
+        return None if v in ("", None) else v
+
+class RoutingFeedback(BaseModel):
+    run_id: str
+    correct_intent: str  # one of INTENT_AGENT_IDS keys or "ask_orchestrate"
+    
+    @field_validator("correct_intent")
+    def known_intent(cls, v):
+        allowed = set(INTENT_AGENT_IDS) | {FALLBACK_INTENT}
+        if v not in allowed:
+            raise ValueError(f"must be one of {sorted(allowed)}")
+        return v
+
 # ==========================
 # POST /get-token
 # ==========================
@@ -296,6 +530,152 @@ async def orchestrate_run(req: RunRequest):
     )
     return result
 
+# ==========================
+# WEBSOCKET /ws/runs
+# ==========================
+class WebSocketSenderStopped(Exception):
+    """The /ws/runs sender task ended (socket closed or a frame failed to send)"""
+
+@app.websocket("/ws/runs")
+async def ws_runs(websocket: WebSocket):
+    """
+    Multiplex many agent runs over one connection
+    - Client sends {"type": "run", "id": ..., "message": ..., "agent_id": ..., "thread_id": ...}
+    - Client sends {"type": "cancel", "id": ...} to stop a run
+    - Frame ids must be strings or integers
+    - Server interleaves {"type": "delta" | "result" | "error" | "cancelled", "id": ...} frames
+    - Outgoing frames go through a bounded queue, so a slow client slows
+      down reading from upstream instead of growing memory
+    - Each run is charged like POST /orchestrate-run against the client's rate limit
+    """
+    await websocket.accept()
+    rate_key = client_key(dict(websocket.scope["headers"]), websocket.scope.get("client"), RATE_LIMIT_API_KEYS)
+    
+    outbox: asyncio.Queue = asyncio.Queue(maxsize=WS_SEND_QUEUE_SIZE)
+    slots = asyncio.Semaphore(WS_MAX_CONCURRENT_RUNS)
+    runs: dict = {}
+    
+    async def sender():
+        try:
+            while True:
+                frame = await outbox.get()
+                await websocket.send_json(frame)
+        except Exception:
+            # Unblock the receive loop; it exits once it sees sender_task is done
+            try:
+                await websocket.close(code=1011)
+            except Exception:
+                pass
+            raise
+    
+    sender_task = asyncio.create_task(sender())
+    
+    async def emit(frame: dict):
+        """Queue a frame, unless the sender stops first; nothing would drain outbox then"""
+        if sender_task.done():
+            raise WebSocketSenderStopped()
+        put = asyncio.ensure_future(outbox.put(frame))
+        try:
+            await asyncio.wait({put, sender_task}, return_when=asyncio.FIRST_COMPLETED)
+        except asyncio.CancelledError:
+            put.cancel()
+            raise
+        if not put.done():
+            put.cancel()
+            raise WebSocketSenderStopped()
+    
+    async def execute(tag, req: RunRequest):
+        async def on_delta(content: str):
+            await emit({"type": "delta", "id": tag, "content": content})
+        
+        try:
+            async with slots:
+                result = await run_orchestrator_agent(
+                    message=req.message,
+                    agent_id=req.agent_id,
+                    thread_id=req.thread_id,
+                    on_delta=on_delta
+                )
+            result.pop("raw_response", None)
+            await emit({"type": "result", "id": tag, **result})
+        except WebSocketSenderStopped:
+            pass
+        except Exception as e:
+            # e.g. token refresh failing before the upstream request is made
+            try:
+                await emit({"type": "error", "id": tag, "detail": str(e)})
+            except WebSocketSenderStopped:
+                pass
+        finally:
+            runs.pop(tag, None)
+    
+    try:
+        while not sender_task.done():
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+            text = message.get("text")
+            if text is None:
+                await emit({"type": "error", "id": None, "detail": "Invalid frame: binary frames are not supported"})
+                continue
+            try:
+                frame = json.loads(text)
+                if not isinstance(frame, dict):
+                    raise ValueError("frame must be a JSON object")
+            except ValueError as e:
+                await emit({"type": "error", "id": None, "detail": f"Invalid frame: {str(e)}"})
+                continue
+            
+            tag = frame.get("id")
+            kind = frame.get("type")
+            
+            if isinstance(tag, bool) or not isinstance(tag, (str, int)):
+                await emit({"type": "error", "id": None, "detail": "Frame id must be a string or integer"})
+                continue
+            
+            if kind == "run":
+                if tag in runs:
+                    await emit({"type": "error", "id": tag, "detail": "Run id already in use"})
+                    continue
+                try:
+                    req = RunRequest(**{k: v for k, v in frame.items() if k not in ("type", "id")})
+                except ValidationError as e:
+                    await emit({"type": "error", "id": tag, "detail": e.errors(include_url=False, include_context=False)})
+                    continue
+                allowed, _, retry_after, _ = rate_limiter.take(rate_key, ENDPOINT_COSTS["/orchestrate-run"])
+                if not allowed:
+                    await emit({
+                        "type": "error",
+                        "id": tag,
+                        "detail": "Rate limit exceeded",
+                        "retry_after": round(retry_after, 1)
+                    })
+                    continue
+                runs[tag] = asyncio.create_task(execute(tag, req))
+            
+            elif kind == "cancel":
+                task = runs.pop(tag, None)
+                if task is None:
+                    await emit({"type": "error", "id": tag, "detail": "Unknown run id"})
+                    continue
+                task.cancel()
+                await emit({"type": "cancelled", "id": tag})
+            
+            else:
+                await emit({"type": "error", "id": tag, "detail": f"Unknown frame type: {kind}"})
+    
+    except (WebSocketDisconnect, WebSocketSenderStopped):
+        pass
+    except RuntimeError:
+        # receive after the sender closed the socket
+        if not sender_task.done():
+            raise
+    finally:
+        pending = list(runs.values()) + [sender_task]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
 # ==========================
 # WORKFLOW-SPECIFIC ENDPOINTS
 # ==========================
@@ -314,6 +694,8 @@ async def submit_health_form(form: HealthFormData):
             detail="ANALYSIS_AGENT_ID not configured in environment"
         )
     
+    metrics = compute_metrics([form])[0]
+    
     # Create detailed message for analysis agent
     message = f"""
 Please analyze the following health profile and provide:
@@ -326,7 +708,7 @@ Health Profile:
 - Age: {form.age} years
 - Weight: {form.weight} kg
 - Height: {form.height} cm
-- BMI: {round(form.weight / ((form.height/100) ** 2), 1)}
+- Computed Metrics (precomputed, do not recalculate): {format_metrics(metrics)}
 - Health Conditions: {', '.join(form.health_conditions) if form.health_conditions else 'None reported'}
 - Dietary Preferences: {', '.join(form.dietary_preferences) if form.dietary_preferences else 'No restrictions'}
 - Activity Level: {form.activity_level}
@@ -356,10 +738,24 @@ Please provide a comprehensive analysis with actionable recommendations.
         "thread_id": thread_id,
         "run_id": result.get("run_id"),
         "analysis": result.get("content"),
+        "metrics": metrics,
         "message": "Health analysis completed successfully",
         "raw_response": result.get("raw_response")
     }
 
+# LOCAL METRICS (no agent call)
+@app.post("/health-metrics")
+async def health_metrics(forms: List[HealthFormData] = Body(max_length=HEALTH_METRICS_MAX_BATCH)):
+    """
+    Compute BMI, BMR, TDEE, calorie/macro targets and risk flags locally
+    - Accepts a batch of up to HEALTH_METRICS_MAX_BATCH health forms
+    - Does not call the orchestrator
+    """
+    return {
+        "success": True,
+        "metrics": compute_metrics(forms)
+    }
+
 # 2. WHATSAPP AGENT
 @app.post("/send-whatsapp")
 async def send_whatsapp_messages(req: ThreadRequest):
@@ -720,6 +1116,84 @@ Answer general queries using orchestration:
         raise HTTPException(status_code=500, detail=f"Ask Orchestrate agent failed: {result.get('error')}")
     return {"success": True, "response": result.get("raw_response"), "thread_id": result.get("thread_id")}
 
+# =========================
+# Ask (local intent routing)
+# =========================
+@app.post("/ask")
+async def ask(req: AskRequest):
+    """
+    Answer a free-text query
+    - Classifies the message locally and runs the matching specialist agent
+    - Falls back to Ask Orchestrate when confidence is low or the agent is not configured
+    """
+    started = time.perf_counter()
+    intent, confidence = classify(req.message)
+    agent_id = INTENT_AGENT_IDS.get(intent) if intent else None
+    router_stats.record_decision(intent if agent_id else None, time.perf_counter() - started)
+    
+    routed_locally = agent_id is not None
+    if not routed_locally:
+        if not ASKORCHESTRATE_ID:
+            raise HTTPException(status_code=500, detail="ASKORCHESTRATE_ID not configured.")
+        agent_id = ASKORCHESTRATE_ID
+    routed_to = intent if routed_locally else FALLBACK_INTENT
+    
+    started = time.perf_counter()
+    result = await run_orchestrator_agent(message=req.message, agent_id=agent_id, thread_id=req.thread_id)
+    if not result.get("success"):
+        raise HTTPException(status_code=500, detail=f"{routed_to} agent failed: {result.get('error')}")
+    router_stats.record_run(routed_locally, result.get("run_id"), routed_to, time.perf_counter() - started)
+    
+    return {
+        "success": True,
+        "routed_to": routed_to,
+        "confidence": round(confidence, 3),
+        "response": result.get("raw_response"),
+        "thread_id": result.get("thread_id"),
+        "run_id": result.get("run_id")
+    }
+
+@app.post("/ask/feedback")
+async def ask_feedback(req: RoutingFeedback):
+    """Report the intent a routed run should have gone to (for accuracy tracking)"""
+    correct = router_stats.record_feedback(req.run_id, req.correct_intent)
+    if correct is None:
+        raise HTTPException(status_code=404, detail="Unknown or already reviewed run_id")
+    return {"success": True, "correct": correct}
+
+@app.get("/ask/stats")
+async def ask_stats():
+    """Local routing hit rate, accuracy and estimated latency saved"""
+    return router_stats.snapshot()
+
+# ==========================
+# RUN HISTORY (served from local ledger)
+# ==========================
+@app.get("/threads/{thread_id}/runs")
+async def get_thread_runs(
+    thread_id: str,
+    limit: int = Query(100, ge=1, le=1000),
+    include_content: bool = True
+):
+    """
+    List runs recorded on a thread, without calling upstream
+    - Returns the most recent `limit` runs, in chronological order (oldest first)
+    """
+    runs = await asyncio.to_thread(run_ledger.thread_runs, thread_id, limit, include_content)
+    return {
+        "thread_id": thread_id,
+        "count": len(runs),
+        "runs": runs
+    }
+
+@app.get("/runs/{run_id}")
+async def get_run(run_id: str):
+    """Look up a single recorded run, without calling upstream"""
+    run = await asyncio.to_thread(run_ledger.get_run, run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail="Run not found in local ledger")
+    return run
+
 # ==========================
 # INFO ENDPOINT
 # ==========================
@@ -730,15 +1204,18 @@ async def root():
         "name": "Multi-Agent Health Orchestrator API",
         "version": "1.0.0",
         "status": "running",
+        "run_ledger": await asyncio.to_thread(run_ledger.stats),
         "token_status": {
             "has_token": token_manager.token is not None,
             "expires_at": token_manager.expires_at.isoformat() if token_manager.expires_at else None
         },
         "endpoints": {
             "health_workflow": {
-                "1_submit_form": "POST /submit-health-form"
+                "1_submit_form": "POST /submit-health-form",
+                "metrics_only": "POST /health-metrics"
             },
             "run_agents": {
+                "ask": "POST /ask",
                 "ask_orchestrate": "POST /run-ask-orchestrate-agent",
                 "pa_manager": "POST /run-pa-manager-agent",
                 "pa_allocation": "POST /run-pa-allocation-agent",
@@ -759,7 +1236,12 @@ async def root():
             "utilities": {
                 "get_token": "POST /get-token",
                 "list_agents": "GET /orchestrate-agents",
-                "run_agent": "POST /orchestrate-run"
+                "run_agent": "POST /orchestrate-run",
+                "run_agents_multiplexed": "WS /ws/runs",
+                "ask_feedback": "POST /ask/feedback",
+                "ask_stats": "GET /ask/stats",
+                "thread_runs": "GET /threads/{thread_id}/runs",
+                "run_details": "GET /runs/{run_id}"
             }
         },
         "configured_agents": {
@@ -0,0 +1,148 @@
+import json
+import math
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+
+# ==========================
+# TOKEN BUCKETS
+# ==========================
+class TokenBucketLimiter:
+    """
+    In-process token buckets, one per client key
+    - Buckets live in an OrderedDict kept in last-used order, so lookups,
+      updates, idle expiry and eviction are all O(1) (amortized)
+    - A bucket idle long enough to refill completely is equivalent to a new
+      one, so it is dropped; at most max_clients buckets are kept
+    """
+
+    def __init__(self, capacity: float, refill_per_sec: float, max_clients: int = 10000):
+        if capacity <= 0 or refill_per_sec <= 0 or max_clients <= 0:
+            raise ValueError("capacity, refill_per_sec and max_clients must be positive")
+        self.capacity = capacity
+        self.refill_per_sec = refill_per_sec
+        self.max_clients = max_clients
+        self.idle_ttl = capacity / refill_per_sec
+        # key -> (tokens, last_update)
+        self.buckets: OrderedDict = OrderedDict()
+
+    def take(self, key: str, cost: float, now: Optional[float] = None) -> Tuple[bool, float, float, float]:
+        """
+        Try to spend cost tokens for key
+        - Returns (allowed, remaining, retry_after_s, reset_s)
+        """
+        now = time.monotonic() if now is None else now
+        self._expire(now)
+        cost = min(cost, self.capacity)
+
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            tokens = self.capacity
+        else:
+            tokens = min(self.capacity, bucket[0] + (now - bucket[1]) * self.refill_per_sec)
+            self.buckets.move_to_end(key)
+
+        allowed = tokens >= cost
+        if allowed:
+            tokens -= cost
+        self.buckets[key] = (tokens, now)
+
+        while len(self.buckets) > self.max_clients:
+            self.buckets.popitem(last=False)
+
+        retry_after = 0.0 if allowed else (cost - tokens) / self.refill_per_sec
+        reset = (self.capacity - tokens) / self.refill_per_sec
+        return allowed, tokens, retry_after, reset
+
+    def _expire(self, now: float):
+        # Least recently used buckets are at the front
+        while self.buckets:
+            tokens, updated = next(iter(self.buckets.values()))
+            if now - updated < self.idle_ttl:
+                break
+            self.buckets.popitem(last=False)
+
+
+def client_key(headers: dict, client: Optional[tuple], api_keys: frozenset = frozenset()) -> str:
+    """
+    Identify a client by API key if it is in the configured allow-list,
+    otherwise by IP address
+    - Unverified headers are ignored; a client could mint a fresh bucket
+      per request by sending a new value each time
+    """
+    api_key = headers.get(b"x-api-key", b"").decode("latin-1")
+    if api_key and api_key in api_keys:
+        return "key:" + api_key
+    return "ip:" + (client[0] if client else "unknown")
+
+
+def endpoint_cost(path: str, costs: dict, default_cost: float) -> float:
+    """Look up a path's cost; keys ending in "*" match by prefix"""
+    if path in costs:
+        return costs[path]
+    for pattern, cost in costs.items():
+        if pattern.endswith("*") and path.startswith(pattern[:-1]):
+            return cost
+    return default_cost
+
+
+# ==========================
+# MIDDLEWARE
+# ==========================
+class RateLimitMiddleware:
+    """
+    Charge each HTTP request its endpoint cost against the client's bucket
+    - Over-limit requests get 429 with Retry-After
+    - Every response carries RateLimit-Limit / -Remaining / -Reset headers
+    """
+
+    def __init__(
+        self,
+        app,
+        limiter: TokenBucketLimiter,
+        costs: dict,
+        default_cost: float = 1,
+        api_keys: frozenset = frozenset()
+    ):
+        self.app = app
+        self.limiter = limiter
+        self.api_keys = api_keys
+        self.costs = costs
+        self.default_cost = default_cost
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        key = client_key(dict(scope["headers"]), scope.get("client"), self.api_keys)
+        cost = endpoint_cost(scope["path"], self.costs, self.default_cost)
+        allowed, remaining, retry_after, reset = self.limiter.take(key, cost)
+
+        rate_headers = [
+            (b"ratelimit-limit", str(int(self.limiter.capacity)).encode()),
+            (b"ratelimit-remaining", str(int(remaining)).encode()),
+            (b"ratelimit-reset", str(math.ceil(reset)).encode()),
+        ]
+
+        if not allowed:
+            body = json.dumps({"detail": "Rate limit exceeded"}).encode()
+            await send({
+                "type": "http.response.start",
+                "status": 429,
+                "headers": rate_headers + [
+                    (b"retry-after", str(math.ceil(retry_after)).encode()),
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                ],
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + rate_headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
@@ -0,0 +1,136 @@
+import sqlite3
+import threading
+import time
+from typing import List, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT,
+    thread_id TEXT,
+    agent_id TEXT NOT NULL,
+    agent TEXT,
+    started_at REAL NOT NULL,
+    finished_at REAL NOT NULL,
+    latency_ms REAL NOT NULL,
+    status TEXT NOT NULL,
+    error TEXT,
+    content_size INTEGER NOT NULL,
+    content TEXT
+);
+CREATE UNIQUE INDEX IF NOT EXISTS runs_run_id ON runs (run_id) WHERE run_id IS NOT NULL;
+CREATE INDEX IF NOT EXISTS runs_thread ON runs (thread_id, started_at);
+CREATE INDEX IF NOT EXISTS runs_started ON runs (started_at);
+"""
+
+COLUMNS = (
+    "run_id", "thread_id", "agent_id", "agent", "started_at", "finished_at",
+    "latency_ms", "status", "error", "content_size", "content",
+)
+
+
+class RunLedger:
+    """
+    Local SQLite index of orchestrator runs
+    - One row per run, looked up by run_id or by thread_id
+    - Content is stored truncated to content_max_chars; content_size is the full length
+    - Rows older than retention_days, or beyond max_rows, are removed by compact(),
+      which the owner is expected to call periodically
+    - Methods block on SQLite; async callers should run them in a worker thread
+    """
+
+    def __init__(
+        self,
+        path: str,
+        retention_days: float = 7,
+        max_rows: int = 50000,
+        content_max_chars: int = 4000
+    ):
+        self.retention_days = retention_days
+        self.max_rows = max_rows
+        self.content_max_chars = content_max_chars
+        self.lock = threading.Lock()
+
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        # auto_vacuum only takes effect if set before the first table is created
+        self.conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.compact()
+
+    def record(
+        self,
+        agent_id: str,
+        agent: Optional[str],
+        started_at: float,
+        finished_at: float,
+        result: dict,
+        thread_id: Optional[str] = None,
+        status: Optional[str] = None
+    ):
+        """
+        Insert one run from a run_orchestrator_agent() result
+        - status defaults to "success" / "error" from result["success"]
+        """
+        content = result.get("content") or ""
+        row = (
+            result.get("run_id"),
+            result.get("thread_id") or thread_id,
+            agent_id,
+            agent,
+            started_at,
+            finished_at,
+            (finished_at - started_at) * 1000,
+            status or ("success" if result.get("success") else "error"),
+            result.get("error"),
+            len(content),
+            content[:self.content_max_chars],
+        )
+        with self.lock:
+            # A repeated run_id (should not happen upstream) replaces the old row
+            self.conn.execute(
+                f"INSERT OR REPLACE INTO runs ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+                row
+            )
+
+    def get_run(self, run_id: str) -> Optional[dict]:
+        with self.lock:
+            row = self.conn.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM runs WHERE run_id = ?", (run_id,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def thread_runs(self, thread_id: str, limit: int = 100, include_content: bool = True) -> List[dict]:
+        """The most recent `limit` runs on a thread, returned oldest first"""
+        columns = COLUMNS if include_content else COLUMNS[:-1]
+        with self.lock:
+            rows = self.conn.execute(
+                f"SELECT {', '.join(columns)} FROM runs WHERE thread_id = ? ORDER BY started_at DESC LIMIT ?",
+                (thread_id, limit)
+            ).fetchall()
+        return [dict(r) for r in reversed(rows)]
+
+    def compact(self) -> int:
+        """Apply retention and the row cap, then release freed pages; returns rows removed"""
+        cutoff = time.time() - self.retention_days * 86400
+        with self.lock:
+            removed = self.conn.execute("DELETE FROM runs WHERE started_at < ?", (cutoff,)).rowcount
+            removed += self.conn.execute(
+                "DELETE FROM runs WHERE id <= (SELECT id FROM runs ORDER BY id DESC LIMIT 1 OFFSET ?)",
+                (self.max_rows,)
+            ).rowcount
+            if removed:
+                self.conn.execute("PRAGMA incremental_vacuum")
+        return removed
+
+    def stats(self) -> dict:
+        with self.lock:
+            count, oldest = self.conn.execute("SELECT COUNT(*), MIN(started_at) FROM runs").fetchone()
+        return {
+            "rows": count,
+            "oldest_started_at": oldest,
+            "retention_days": self.retention_days,
+            "max_rows": self.max_rows,
+        }
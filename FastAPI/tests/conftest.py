@@ -0,0 +1,9 @@
+import os
+import sys
+import tempfile
+
+# Modules in FastAPI/ import each other as top-level modules (uvicorn main:app)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Keep main's run ledger out of the source tree
+os.environ.setdefault("LEDGER_DB_PATH", os.path.join(tempfile.mkdtemp(), "run_ledger.db"))
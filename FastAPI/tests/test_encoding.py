@@ -0,0 +1,80 @@
+import gzip
+
+import msgpack
+import pytest
+import zstandard
+
+import encoding
+from encoding import NegotiatedResponse, negotiation, pick_encoding, wants_msgpack
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("", None),
+    ("identity", None),
+    ("gzip", "gzip"),
+    ("gzip, deflate, br, zstd", "zstd"),
+    ("zstd;q=0, gzip", "gzip"),
+    ("gzip;q=0", None),
+    ("gzip; q=0.5", "gzip"),
+    ("*", "zstd"),
+    ("gzip;q=1, zstd;q=0.1", "gzip"),
+    ("gzip;q=0, *", "zstd"),
+    ("gzip;q=0, zstd;q=0, *", None),
+    ("zstd;q=0, *;q=0.5", "gzip"),
+])
+def test_pick_encoding(header, expected):
+    assert pick_encoding(header) == expected
+
+
+def test_pick_encoding_without_zstandard(monkeypatch):
+    monkeypatch.setattr(encoding, "zstandard", None)
+    assert pick_encoding("zstd") is None
+    assert pick_encoding("gzip;q=0, *") is None
+    assert pick_encoding("zstd, gzip;q=0.5") == "gzip"
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("", False),
+    ("application/json", False),
+    ("*/*", False),
+    ("application/msgpack", True),
+    ("application/msgpack;q=0", False),
+    ("application/json, application/msgpack;q=0.1", False),
+    ("application/msgpack, application/json;q=0.9", True),
+    ("application/msgpack, */*", True),
+])
+def test_wants_msgpack(header, expected):
+    assert wants_msgpack(header) is expected
+
+
+def render(content, accept="", accept_encoding=""):
+    token = negotiation.set((accept, accept_encoding))
+    try:
+        return NegotiatedResponse(content)
+    finally:
+        negotiation.reset(token)
+
+
+def test_small_body_not_compressed():
+    response = render({"ok": True}, accept_encoding="gzip")
+    assert "content-encoding" not in response.headers
+    assert response.body == b'{"ok":true}'
+
+
+def test_large_body_compressed_above_threshold():
+    content = {"analysis": "x" * encoding.COMPRESS_MIN_SIZE}
+    response = render(content, accept_encoding="gzip")
+    assert response.headers["content-encoding"] == "gzip"
+    assert int(response.headers["content-length"]) == len(response.body)
+    assert gzip.decompress(response.body) == encoding.dumps_json(content)
+
+    response = render(content, accept_encoding="zstd")
+    assert response.headers["content-encoding"] == "zstd"
+    assert zstandard.ZstdDecompressor().decompress(response.body) == encoding.dumps_json(content)
+
+
+def test_msgpack_response():
+    response = render({"a": [1, 2]}, accept="application/msgpack")
+    assert response.media_type == "application/msgpack"
+    assert msgpack.unpackb(response.body) == {"a": [1, 2]}
+    assert response.headers["vary"] == "Accept, Accept-Encoding"
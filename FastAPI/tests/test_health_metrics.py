@@ -0,0 +1,107 @@
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+import main
+from health_metrics import compute_metrics, format_metrics
+from main import HealthFormData
+
+BASE = {
+    "name": "John Doe", "age": 35, "weight": 80, "height": 175,
+    "health_conditions": ["diabetes", "hypertension"],
+    "dietary_preferences": ["vegetarian", "low-carb"],
+    "activity_level": "moderate", "goals": ["weight loss"],
+}
+
+
+def test_metrics_for_reference_profile():
+    m = compute_metrics([HealthFormData(**BASE)])[0]
+    assert m["bmi"] == 26.1
+    assert m["bmi_category"] == "overweight"
+    assert m["bmr_kcal"] == 1641  # Mifflin-St Jeor midpoint constant
+    assert m["tdee_kcal"] == 2543
+    assert m["calorie_target_kcal"] == 2043
+    assert m["risk_flags"] == ["diabetes", "hypertension", "overweight"]
+    assert format_metrics(m).startswith("BMI 26.1 (overweight); BMR 1641 kcal")
+
+
+def test_batch_matches_single_rows():
+    forms = [HealthFormData(**BASE), HealthFormData(**dict(BASE, gender="female", weight=50, age=70))]
+    assert compute_metrics(forms) == [compute_metrics([f])[0] for f in forms]
+
+
+@pytest.mark.parametrize("age", [20, 45, 80])
+@pytest.mark.parametrize("weight, height", [(45, 170), (70, 175), (150, 150), (200, 190)])
+@pytest.mark.parametrize("gender", ["male", "female", None])
+@pytest.mark.parametrize("activity_level", ["sedentary", "very_active"])
+@pytest.mark.parametrize("goals, conditions, prefs", [
+    (["weight loss"], [], []),
+    (["build muscle"], ["diabetes"], []),
+    ([], [], ["keto"]),
+])
+def test_macros_add_up_to_target(age, weight, height, gender, activity_level, goals, conditions, prefs):
+    form = HealthFormData(**dict(
+        BASE, age=age, weight=weight, height=height, gender=gender, activity_level=activity_level,
+        goals=goals, health_conditions=conditions, dietary_preferences=prefs,
+    ))
+    m = compute_metrics([form])[0]
+    macros = m["macros_g"]
+    kcal = 4 * macros["protein"] + 4 * macros["carbs"] + 9 * macros["fat"]
+    # Only per-macro rounding separates the two
+    assert kcal == pytest.approx(m["calorie_target_kcal"], abs=9)
+    assert min(macros.values()) > 0
+    assert 9 * macros["fat"] >= 0.2 * m["calorie_target_kcal"] - 5
+
+
+def test_obese_protein_uses_adjusted_weight():
+    form = HealthFormData(**dict(BASE, age=80, weight=150, height=150, gender="female",
+                                 activity_level="sedentary", health_conditions=[]))
+    m = compute_metrics([form])[0]
+    assert m["calorie_target_kcal"] == 1752
+    assert m["macros_g"]["protein"] < 1.2 * 150
+
+
+@pytest.mark.parametrize("condition, flag, carbs_restricted", [
+    ("Type 2 diabetes", "diabetes", True),
+    ("prediabetes", "prediabetes", True),
+    ("pre-diabetic", "prediabetes", True),
+    ("non-diabetic", None, False),
+])
+def test_diabetic_carb_rule_matches_flags(condition, flag, carbs_restricted):
+    def carbs(conditions):
+        form = HealthFormData(**dict(BASE, health_conditions=conditions, dietary_preferences=[], goals=[]))
+        return compute_metrics([form])[0]
+
+    m = carbs([condition])
+    flags = [f for f in m["risk_flags"] if "diabet" in f]
+    assert flags == ([flag] if flag else [])
+    assert (m["macros_g"]["carbs"] < carbs([])["macros_g"]["carbs"]) is carbs_restricted
+
+
+def test_heartburn_is_not_cardiac():
+    flags = compute_metrics([HealthFormData(**dict(BASE, health_conditions=["heartburn"]))])[0]["risk_flags"]
+    assert "cardiac" not in flags
+    flags = compute_metrics([HealthFormData(**dict(BASE, health_conditions=["Heart disease"]))])[0]["risk_flags"]
+    assert "cardiac" in flags
+
+
+@pytest.mark.parametrize("field, value", [
+    ("height", 0), ("weight", -5), ("weight", float("nan")), ("height", float("inf")), ("age", 0),
+])
+def test_invalid_body_measurements_rejected(field, value):
+    with pytest.raises(ValidationError):
+        HealthFormData(**dict(BASE, **{field: value}))
+
+
+def test_health_metrics_endpoint_rejects_zero_height():
+    main.rate_limiter.buckets.clear()
+    client = TestClient(main.app)
+    assert client.post("/health-metrics", json=[dict(BASE, height=0)]).status_code == 422
+
+
+def test_health_metrics_endpoint_caps_batch_size():
+    main.rate_limiter.buckets.clear()
+    client = TestClient(main.app)
+    too_many = [BASE] * (main.HEALTH_METRICS_MAX_BATCH + 1)
+    assert client.post("/health-metrics", json=too_many).status_code == 422
+    assert client.post("/health-metrics", json=[BASE] * 2).status_code == 200
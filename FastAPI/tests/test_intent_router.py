@@ -0,0 +1,74 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import intent_router
+import main
+from intent_router import RouterStats, classify
+
+
+@pytest.mark.parametrize("message, intent", [
+    ("What should I eat for breakfast to get more protein?", "diet"),
+    ("I can't sleep at night, insomnia", "sleep"),
+    ("Give me a gym workout for my legs", "exercise"),
+    ("My neck and back hurt from sitting at my desk", "posture"),
+    ("I missed my blood pressure medication", "alert"),
+    ("Book a doctor appointment", "appointment"),
+])
+def test_confident_queries_route_locally(message, intent):
+    routed, confidence = classify(message)
+    assert routed == intent
+    assert confidence >= intent_router.MIN_CONFIDENCE
+
+
+def test_no_keywords_falls_back():
+    assert classify("What's the capital of France?") == (None, 0.0)
+
+
+def test_ambiguous_query_falls_back():
+    # "weight" belongs to both diet and exercise, so neither dominates
+    routed, confidence = classify("How can I lose weight?")
+    assert routed is None
+    assert confidence == pytest.approx(0.5)
+
+
+@pytest.mark.parametrize("message", [
+    "sleep",
+    "I can't sleep",
+    "Why did my run fail?",
+    "Can you walk me through my insurance claim?",
+    "Is my back-end server down?",
+])
+def test_single_keyword_falls_back(message):
+    assert classify(message)[0] is None
+
+
+def test_plural_forms_match():
+    assert classify("healthy meals and snacks")[0] == "diet"
+
+
+def test_feedback_accuracy_split_local_and_fallback():
+    stats = RouterStats()
+    stats.record_decision("sleep", 0.0001)
+    stats.record_run(True, "r1", "sleep", 1.0)
+    stats.record_decision("diet", 0.0001)
+    stats.record_run(True, "r2", "diet", 1.0)
+    stats.record_decision(None, 0.0001)
+    stats.record_run(False, "r3", "ask_orchestrate", 3.0)
+
+    assert stats.record_feedback("r1", "sleep") is True
+    assert stats.record_feedback("r2", "exercise") is False
+    assert stats.record_feedback("r3", "diet") is False
+    assert stats.record_feedback("r1", "sleep") is None
+
+    snap = stats.snapshot()
+    assert snap["feedback"]["local"] == {"total": 2, "correct": 1, "accuracy": 0.5}
+    assert snap["feedback"]["fallback"] == {"total": 1, "correct": 0, "accuracy": 0.0}
+    assert snap["local_hit_rate"] == pytest.approx(2 / 3)
+    assert snap["estimated_latency_saved_s"] == pytest.approx(4.0)
+
+
+def test_feedback_endpoint_rejects_unknown_intent():
+    main.rate_limiter.buckets.clear()
+    client = TestClient(main.app)
+    assert client.post("/ask/feedback", json={"run_id": "r1", "correct_intent": "dite"}).status_code == 422
+    assert client.post("/ask/feedback", json={"run_id": "r1", "correct_intent": "diet"}).status_code == 404
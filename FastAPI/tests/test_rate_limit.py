@@ -0,0 +1,77 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from rate_limit import TokenBucketLimiter, client_key, endpoint_cost
+
+
+def test_take_spends_and_refills():
+    limiter = TokenBucketLimiter(capacity=10, refill_per_sec=1)
+    assert limiter.take("a", 6, now=0) == (True, 4, 0.0, 6.0)
+    allowed, remaining, retry_after, _ = limiter.take("a", 6, now=0)
+    assert not allowed and remaining == 4 and retry_after == 2.0
+    # 2 seconds later 2 tokens have refilled
+    assert limiter.take("a", 6, now=2)[:2] == (True, 0)
+
+
+def test_refill_is_capped_at_capacity():
+    limiter = TokenBucketLimiter(capacity=10, refill_per_sec=1)
+    limiter.take("a", 1, now=0)
+    assert limiter.take("a", 0, now=5)[1] == 10
+
+
+def test_cost_above_capacity_is_clamped():
+    limiter = TokenBucketLimiter(capacity=5, refill_per_sec=1)
+    assert limiter.take("a", 50, now=0)[0] is True
+
+
+def test_idle_buckets_expire():
+    limiter = TokenBucketLimiter(capacity=10, refill_per_sec=1)
+    limiter.take("a", 1, now=0)
+    limiter.take("b", 1, now=5)
+    limiter.take("c", 1, now=10)
+    # "a" has been idle for idle_ttl (10s) and is dropped
+    assert list(limiter.buckets) == ["b", "c"]
+
+
+def test_least_recently_used_bucket_evicted():
+    limiter = TokenBucketLimiter(capacity=10, refill_per_sec=1, max_clients=2)
+    limiter.take("a", 1, now=0)
+    limiter.take("b", 1, now=1)
+    limiter.take("a", 1, now=2)
+    limiter.take("c", 1, now=3)
+    assert list(limiter.buckets) == ["a", "c"]
+
+
+@pytest.mark.parametrize("kwargs", [{"refill_per_sec": 0}, {"capacity": 0}, {"max_clients": 0}])
+def test_invalid_config_rejected(kwargs):
+    with pytest.raises(ValueError):
+        TokenBucketLimiter(**{"capacity": 10, "refill_per_sec": 1, **kwargs})
+
+
+def test_client_key_ignores_unlisted_headers():
+    client = ("10.0.0.1", 1234)
+    assert client_key({b"x-api-key": b"random"}, client) == "ip:10.0.0.1"
+    assert client_key({b"x-user-id": b"random"}, client) == "ip:10.0.0.1"
+    assert client_key({b"x-api-key": b"team"}, client, frozenset({"team"})) == "key:team"
+
+
+def test_endpoint_cost_prefix_match():
+    costs = {"/submit-health-form": 5, "/run-*": 3}
+    assert endpoint_cost("/submit-health-form", costs, 1) == 5
+    assert endpoint_cost("/run-diet-agent", costs, 1) == 3
+    assert endpoint_cost("/", costs, 1) == 1
+
+
+def test_middleware_returns_429_with_headers():
+    main.rate_limiter.buckets.clear()
+    client = TestClient(main.app)
+    statuses = [client.get("/", headers={"x-user-id": str(i)}).status_code for i in range(31)]
+    assert statuses[:30] == [200] * 30 and statuses[30] == 429
+
+    response = client.get("/")
+    assert response.json() == {"detail": "Rate limit exceeded"}
+    assert response.headers["ratelimit-limit"] == "30"
+    assert response.headers["ratelimit-remaining"] == "0"
+    assert int(response.headers["retry-after"]) >= 1
+    main.rate_limiter.buckets.clear()
@@ -0,0 +1,119 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+import main
+from run_ledger import RunLedger
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    return RunLedger(str(tmp_path / "ledger.db"), retention_days=1, max_rows=5)
+
+
+def ok(run_id, thread_id="t1", content="hello"):
+    return {"success": True, "run_id": run_id, "thread_id": thread_id, "content": content}
+
+
+def test_record_and_lookup(ledger):
+    now = time.time()
+    ledger.record("A", "diet", now, now + 0.5, ok("r1"))
+    ledger.record("B", None, now + 1, now + 2, {"success": False, "error": "HTTP 500"}, thread_id="t1")
+
+    run = ledger.get_run("r1")
+    assert run["agent"] == "diet" and run["status"] == "success"
+    assert run["latency_ms"] == pytest.approx(500)
+    assert run["content_size"] == 5
+
+    runs = ledger.thread_runs("t1", include_content=False)
+    assert [r["status"] for r in runs] == ["success", "error"]
+    assert "content" not in runs[0]
+
+
+def test_thread_runs_limit_keeps_newest(tmp_path):
+    ledger = RunLedger(str(tmp_path / "ledger.db"))
+    now = time.time()
+    for i in range(5):
+        ledger.record("A", None, now + i, now + i, ok(f"r{i}"))
+    assert [r["run_id"] for r in ledger.thread_runs("t1", limit=2)] == ["r3", "r4"]
+    assert [r["run_id"] for r in ledger.thread_runs("t1")] == ["r0", "r1", "r2", "r3", "r4"]
+
+
+def test_content_truncated_but_size_kept(tmp_path):
+    ledger = RunLedger(str(tmp_path / "ledger.db"), content_max_chars=10)
+    now = time.time()
+    ledger.record("A", None, now, now, ok("r1", content="x" * 100))
+    run = ledger.get_run("r1")
+    assert run["content_size"] == 100 and len(run["content"]) == 10
+
+
+def test_repeated_run_id_replaces_row(ledger):
+    now = time.time()
+    ledger.record("A", None, now, now, ok("r1", content="first"))
+    ledger.record("A", None, now, now, ok("r1", content="second"))
+    assert ledger.stats()["rows"] == 1
+    assert ledger.get_run("r1")["content"] == "second"
+
+
+def test_compact_applies_retention_and_row_cap(ledger):
+    now = time.time()
+    for i in range(3):
+        ledger.record("A", None, now - 2 * 86400, now, ok(f"old{i}"))
+    for i in range(7):
+        ledger.record("A", None, now, now, ok(f"new{i}"))
+
+    assert ledger.compact() == 5
+    assert ledger.stats()["rows"] == 5
+    assert ledger.get_run("old0") is None and ledger.get_run("new1") is None
+    assert ledger.get_run("new6") is not None
+
+
+@pytest.fixture
+def main_ledger(ledger, monkeypatch):
+    monkeypatch.setattr(main, "run_ledger", ledger)
+    return ledger
+
+
+def test_cancelled_and_failed_runs_are_recorded(main_ledger, monkeypatch):
+    async def fake_call(message, agent_id, thread_id=None, on_delta=None):
+        if agent_id == "iam-down":
+            raise HTTPException(status_code=500, detail="Failed to get token")
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(main, "call_orchestrator", fake_call)
+
+    async def scenario():
+        with pytest.raises(HTTPException):
+            await main.run_orchestrator_agent("hi", "iam-down", thread_id="t9")
+
+        task = asyncio.create_task(main.run_orchestrator_agent("hi", "hang", thread_id="t9"))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        # The cancelled run's write finishes in the background
+        for _ in range(100):
+            if len(main_ledger.thread_runs("t9")) == 2:
+                break
+            await asyncio.sleep(0.01)
+
+    asyncio.run(scenario())
+    runs = main_ledger.thread_runs("t9")
+    assert [(r["agent_id"], r["status"]) for r in runs] == [("iam-down", "error"), ("hang", "cancelled")]
+    assert "Failed to get token" in runs[0]["error"]
+
+
+def test_history_endpoints(main_ledger):
+    now = time.time()
+    main_ledger.record("A", None, now, now, ok("r1"))
+    main.rate_limiter.buckets.clear()
+    client = TestClient(main.app)
+
+    assert client.get("/runs/r1").json()["run_id"] == "r1"
+    assert client.get("/runs/missing").status_code == 404
+    assert client.get("/threads/t1/runs").json()["count"] == 1
+    assert client.get("/threads/t1/runs?limit=-1").status_code == 422
+    assert client.get("/threads/t1/runs?limit=100000").status_code == 422
@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+import main
+
+
+@pytest.fixture
+def client(monkeypatch):
+    async def fake_run(message, agent_id, thread_id=None, on_delta=None):
+        if agent_id == "hang":
+            await asyncio.Event().wait()
+        if agent_id == "iam-down":
+            raise HTTPException(status_code=500, detail="Failed to get token")
+        await on_delta("hello")
+        return {"success": True, "thread_id": "t1", "run_id": "r1", "content": "hello", "raw_response": "..."}
+
+    monkeypatch.setattr(main, "run_orchestrator_agent", fake_run)
+    main.rate_limiter.buckets.clear()
+    return TestClient(main.app)
+
+
+def test_run_streams_delta_then_result(client):
+    with client.websocket_connect("/ws/runs") as ws:
+        ws.send_json({"type": "run", "id": "a", "message": "hi", "agent_id": "diet"})
+        assert ws.receive_json() == {"type": "delta", "id": "a", "content": "hello"}
+        result = ws.receive_json()
+        assert result["type"] == "result" and result["id"] == "a" and result["run_id"] == "r1"
+        assert "raw_response" not in result
+
+
+def test_cancel_running_run(client):
+    with client.websocket_connect("/ws/runs") as ws:
+        ws.send_json({"type": "run", "id": 1, "message": "hi", "agent_id": "hang"})
+        ws.send_json({"type": "cancel", "id": 1})
+        assert ws.receive_json() == {"type": "cancelled", "id": 1}
+
+        ws.send_json({"type": "cancel", "id": 1})
+        assert ws.receive_json() == {"type": "error", "id": 1, "detail": "Unknown run id"}
+
+
+def test_run_exception_is_reported(client):
+    with client.websocket_connect("/ws/runs") as ws:
+        ws.send_json({"type": "run", "id": "a", "message": "hi", "agent_id": "iam-down"})
+        frame = ws.receive_json()
+        assert frame["type"] == "error" and frame["id"] == "a"
+        assert "Failed to get token" in frame["detail"]
+
+
+def test_binary_frame_keeps_socket_open(client):
+    with client.websocket_connect("/ws/runs") as ws:
+        ws.send_bytes(b'{"type":"run"}')
+        frame = ws.receive_json()
+        assert frame["type"] == "error" and frame["id"] is None
+        assert frame["detail"].startswith("Invalid frame")
+
+        ws.send_json({"type": "run", "id": "a", "message": "hi", "agent_id": "diet"})
+        assert ws.receive_json()["type"] == "delta"
+        assert ws.receive_json()["type"] == "result"
+
+
+def test_malformed_frames_keep_socket_open(client):
+    with client.websocket_connect("/ws/runs") as ws:
+        ws.send_text("not json")
+        assert ws.receive_json()["detail"].startswith("Invalid frame")
+
+        ws.send_json({"type": "run", "id": [1], "message": "hi", "agent_id": "diet"})
+        assert ws.receive_json() == {"type": "error", "id": None, "detail": "Frame id must be a string or integer"}
+
+        ws.send_json({"type": "run", "id": "b", "agent_id": "diet"})
+        frame = ws.receive_json()
+        assert frame["type"] == "error" and frame["id"] == "b"
+
+        ws.send_json({"type": "run", "id": "c", "message": "hi", "agent_id": "diet"})
+        assert ws.receive_json()["type"] == "delta"
+        assert ws.receive_json()["type"] == "result"